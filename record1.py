@@ -1,82 +1,565 @@
 import streamlit as st
-import whisper
+import torch
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.vad import get_speech_timestamps
 import sounddevice as sd
 from scipy.io.wavfile import write
+from scipy.signal import resample_poly
 import numpy as np
-import tempfile
+import io
 import os
+import hashlib
+import queue
 import subprocess
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+
+# Whisper models consume float32 mono audio at 16 kHz
+SAMPLE_RATE = 16000
+
+# Number of VAD-split (<= 30 s) chunks decoded together in one batched forward pass. Large GPU
+# batches keep the tensor cores busy; on CPU the cores are already saturated by a small batch.
+BATCH_SIZES = {"cuda": 16, "cpu": 4}
+
+# Decoding presets for the sidebar's quality/speed trade-off. Greedy decoding without the
+# temperature-fallback loop or cross-window conditioning does the least decoder work per window.
+# "Best quality" needs sequential decoding: the batched pipeline decodes independent chunks, so it
+# can't condition on previous text and only uses the first temperature.
+DECODING_PRESETS = {
+    "Fastest": {"beam_size": 1, "best_of": 1, "temperature": 0.0, "condition_on_previous_text": False},
+    "Balanced": {"beam_size": 3, "best_of": 1, "temperature": 0.0, "condition_on_previous_text": False},
+    "Best quality": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+    },
+}
+
+# Audio quieter than this RMS (about -60 dBFS) is treated as silence without running Whisper
+SILENCE_RMS = 1e-3
+
+# Clips up to this long get a Silero VAD pre-check on every backend, so speech-free audio never
+# loads the model or runs language detection. For faster-whisper such clips pay for VAD twice
+# (again in vad_filter), which is tens of milliseconds; longer audio relies on the backend alone.
+# Less detected speech than MIN_SPEECH_SECONDS is "no speech".
+VAD_PRECHECK_SECONDS = 60
+MIN_SPEECH_SECONDS = 0.3
+
+# Compute types offered per resolved device. CTranslate2 has no efficient FP16 on CPU and rejects
+# float16/int8_float16 there; MLX only exists on Apple Silicon, which has no CUDA.
+COMPUTE_TYPES = {
+    "cuda": ["auto", "int8", "int8_float16", "float16", "float32", "ggml-q5"],
+    "cpu": ["auto", "int8", "float32", "ggml-q5", "mlx"],
+}
+
+# Finished transcripts kept in memory so re-uploading the same content is instant
+TRANSCRIPT_CACHE_SIZE = 64
+
+# Quiet, multithreaded ffmpeg: only errors reach stderr and decoding uses every core
+FFMPEG_FLAGS = ["-hide_banner", "-loglevel", "error", "-threads", "0"]
 
 # Ensure ffmpeg path is included (update if needed)
 os.environ["PATH"] += os.pathsep + r"C:\ffmpeg\ffmpeg-7.1.1-full_build\bin"
 
 # ------------------- FFmpeg Check -------------------
+@st.cache_resource(show_spinner=False)
 def check_ffmpeg():
+    """
+    Probe for ffmpeg once per process instead of forking it on every Streamlit rerun.
+    """
     try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
     except FileNotFoundError:
-        st.error("❌ FFmpeg not found. Install FFmpeg and add it to PATH.")
-check_ffmpeg()
+        return False
+    return True
+
+if not check_ffmpeg():
+    st.error("❌ FFmpeg not found. Install FFmpeg and add it to PATH.")
 
-# ------------------- Extract Audio Function (Missing in your code) -------------------
-def extract_audio_from_video(video_path):
+# ------------------- Extract Audio Function -------------------
+def decode_to_float32(input_args, chunks=None):
     """
-    Extract audio from a video file into a WAV (16kHz mono) and return the path.
+    Decode the audio of an ffmpeg input straight to float32 16 kHz mono samples read from stdout.
+    One ffmpeg process does the demux, decode, resample and normalization; nothing is written to disk.
+    When `chunks` (an iterable of bytes) is given, a helper thread writes it to ffmpeg's stdin,
+    so the input should be "-i", "pipe:0".
     """
-    import tempfile
-    import subprocess
-    import os
-
-    # Create a proper temporary WAV file
-    tmp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-    audio_path = tmp_audio.name
-    tmp_audio.close()  # Close it so FFmpeg can write
-
-    # FFmpeg command
     command = [
-        "ffmpeg",
-        "-i", video_path,
+        "ffmpeg", *FFMPEG_FLAGS,
+        *input_args,
         "-vn",               # no video
-        "-acodec", "pcm_s16le",
-        "-ar", "16000",      # 16 kHz
+        "-f", "f32le",       # raw float32 samples on stdout
+        "-acodec", "pcm_f32le",
+        "-ar", str(SAMPLE_RATE),
         "-ac", "1",          # mono
-        "-y",                # overwrite
-        audio_path
+        "pipe:1"
     ]
 
-    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    if result.returncode != 0:
-        raise RuntimeError(f"FFmpeg failed:\n{result.stderr.decode()}")
+    # With -loglevel error stderr stays tiny, so capturing it (and reading it after stdout when
+    # feeding stdin) can't fill the pipe and stall ffmpeg
+    stdin = subprocess.PIPE if chunks is not None else None
+    process = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if chunks is None:
+        raw, errors = process.communicate()
+    else:
+        feed_errors = []
 
-    return audio_path
+        def feed():
+            try:
+                for chunk in chunks:
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its stderr says why
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        raw = process.stdout.read()
+        errors = process.stderr.read()
+        process.wait()
+        writer.join()
+        if feed_errors:
+            raise feed_errors[0]
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed:\n{errors.decode()}")
+
+    return np.frombuffer(raw, dtype=np.float32)
+
+
+# ------------------- YouTube Audio -------------------
+@st.cache_resource(show_spinner=False)
+def get_youtube_dl():
+    """
+    Share one in-process YoutubeDL so its HTTP session and cookies persist between requests,
+    together with the lock that serializes it (YoutubeDL isn't thread-safe and every session
+    thread uses this instance). Returns None when yt-dlp isn't installed; the import is only
+    attempted once per process.
+    """
+    try:
+        from yt_dlp import YoutubeDL
+    except ImportError:
+        return None
+    ydl = YoutubeDL({"format": "bestaudio/best", "quiet": True, "no_warnings": True, "noplaylist": True})
+    return ydl, threading.Lock()
+
+def fetch_in_chunks(url, headers, chunk_size):
+    """
+    Yield a stream as consecutive Range requests of `chunk_size` bytes, like yt-dlp's own HTTP
+    downloader does with http_chunk_size: YouTube throttles long unchunked reads to about
+    playback speed.
+    """
+    start = 0
+    while True:
+        request = urllib.request.Request(url, headers={**headers, "Range": f"bytes={start}-{start + chunk_size - 1}"})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                data = response.read()
+                partial = response.status == 206
+        except urllib.error.HTTPError as e:
+            if e.code == 416:  # the previous chunk ended exactly at the end of the stream
+                return
+            raise
+        if data:
+            yield data
+        # A 200 means the server ignored Range and sent everything at once
+        if not partial or len(data) < chunk_size:
+            return
+        start += len(data)
+
+def download_youtube_audio(url):
+    """
+    Resolve the audio-only stream with yt-dlp and decode it with ffmpeg into float32 16 kHz
+    samples. Nothing touches the disk and the video stream is never downloaded.
+    """
+    ydl, lock = get_youtube_dl()
+    with lock:
+        info = ydl.extract_info(url, download=False)
+        if "entries" in info:
+            raise ValueError("Playlist links aren't supported; paste the link of a single video.")
+
+        # A merged selection lists its parts instead of a single URL; take the one carrying audio
+        stream = info
+        if "url" not in stream:
+            audio_formats = [f for f in info.get("requested_formats", []) if f.get("acodec") != "none"]
+            if not audio_formats:
+                raise ValueError("yt-dlp found no downloadable audio stream for this link.")
+            stream = audio_formats[0]
+
+        headers = dict(stream.get("http_headers", {}))
+        # yt-dlp keeps cookies out of http_headers; rebuild the Cookie header for this stream's URL
+        cookies = ydl.cookiejar.get_cookie_header(stream["url"])
+        if cookies:
+            headers["Cookie"] = cookies
+
+    # Formats yt-dlp would download in chunks (every YouTube https format) are fetched the same way
+    # and piped into ffmpeg; a single long GET from ffmpeg would be throttled
+    chunk_size = stream.get("downloader_options", {}).get("http_chunk_size")
+    if chunk_size and stream.get("protocol") in ("http", "https"):
+        return decode_to_float32(["-i", "pipe:0"], chunks=fetch_in_chunks(stream["url"], headers, chunk_size))
+
+    header_lines = "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+    # Other streams (e.g. HLS) go to ffmpeg directly, so let it reconnect on dropped connections
+    return decode_to_float32([
+        "-reconnect", "1",
+        "-reconnect_streamed", "1",
+        "-reconnect_delay_max", "5",
+        "-headers", header_lines,
+        "-i", stream["url"],
+    ])
+
+
+# ------------------- Silence Check -------------------
+def is_silent(audio):
+    """
+    Cheap RMS gate (a single dot product) so silent recordings never reach the model.
+    """
+    if audio.size == 0:
+        return True
+    return float(np.sqrt(np.dot(audio, audio) / audio.size)) < SILENCE_RMS
+
+def has_speech(audio):
+    """
+    RMS gate first, then Silero VAD on short clips, so quiet or speech-free recordings
+    (background noise, a cough) never reach the transcription backend.
+    """
+    if is_silent(audio):
+        return False
+    if audio.size > VAD_PRECHECK_SECONDS * SAMPLE_RATE:
+        return True
+    spans = get_speech_timestamps(audio, sampling_rate=SAMPLE_RATE)
+    return sum(span["end"] - span["start"] for span in spans) >= MIN_SPEECH_SECONDS * SAMPLE_RATE
+
+
+# ------------------- In-Memory Audio -------------------
+def pcm16_to_float32(audio, rate):
+    """
+    Convert int16 PCM samples into a float32 mono 16 kHz array that can be passed straight to Whisper.
+    """
+    # One pass and one allocation: cast and scale inside the ufunc instead of astype() followed by a division
+    samples = np.multiply(audio.ravel(), 1 / 32768.0, dtype=np.float32)
+    if rate != SAMPLE_RATE:
+        # Polyphase FIR resampling in NumPy; resample_poly reduces up/down by their gcd itself
+        samples = resample_poly(samples, SAMPLE_RATE, rate).astype(np.float32, copy=False)
+    return samples
 
 
 # Page config
 st.set_page_config(page_title="🎤 Record or Upload & Transcribe", layout="centered")
 st.title("🎙️ Whisper Speech-to-Text")
 
+# ------------------- Device Selection -------------------
+def resolve_device(choice):
+    """
+    Map the sidebar device choice to "cuda" or "cpu", falling back to CPU when CUDA is missing.
+    """
+    if choice == "auto":
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    if choice == "cuda" and not torch.cuda.is_available():
+        st.warning("⚠️ CUDA not available, falling back to CPU.")
+        return "cpu"
+    return choice
+
 # ------------------- Sidebar Settings -------------------
 with st.sidebar:
     st.header("🔧 Settings")
     language = st.selectbox("Spoken Language", ["auto", "en", "hi", "es", "fr", "de", "ja", "zh"])
-    model_size = st.selectbox("Whisper Model Size", ["base", "small", "medium"], index=1)
+    model_size = st.selectbox(
+        "Whisper Model Size",
+        ["base", "small", "medium", "distil-small.en", "distil-medium.en", "distil-large-v2"],
+        index=1,
+        help="Distilled models keep the encoder but only 2 decoder layers: much faster decoding at similar accuracy (faster-whisper only; every distil model, including distil-large-v2, is English-only).",
+    )
+    if model_size.startswith("distil-") and language not in ("auto", "en"):
+        st.warning("⚠️ Distilled models only transcribe English; pick base/small/medium for other languages.")
+    device = resolve_device(st.selectbox("Device", ["auto", "cpu", "cuda"]))
+    compute_type = st.selectbox(
+        "Compute Type",
+        COMPUTE_TYPES[device],
+        help="int8/float types run on faster-whisper, ggml-q5 on whisper.cpp (CPU), mlx on Apple Silicon.",
+    )
+    if compute_type == "mlx":
+        st.caption("🖥️ Using Apple Silicon (MLX)")
+    elif device == "cuda" and compute_type != "ggml-q5":
+        st.caption(f"🖥️ Using GPU: {torch.cuda.get_device_name(0)}")
+    else:
+        st.caption("🖥️ Using CPU")
+    quality = st.select_slider("Quality vs Speed", options=list(DECODING_PRESETS), value="Fastest")
     st.markdown("---")
     st.subheader("🎤 Recorder Settings")
     duration = st.slider("Recording Duration (seconds)", 1, 20, 5)
     sample_rate = st.selectbox("Sample Rate (Hz)", [16000, 22050, 44100], index=0)
 
+# ------------------- Transcription Backends -------------------
+def available_cpus():
+    """
+    Cores this process may actually run on: honors CPU affinity (taskset, cpusets, container
+    cpuset limits), which os.cpu_count() ignores. Falls back to os.cpu_count() where unsupported.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class Transcriber(Protocol):
+    def transcribe(self, audio, lang, options):
+        """
+        Yield segment texts for a float32 16 kHz array (or a file path), decoding with one of
+        the DECODING_PRESETS; backends apply the options they support.
+        """
+
+
+class FasterWhisperTranscriber:
+    """
+    CTranslate2 backend. Presets without conditioning or temperature fallback go through a
+    batched pipeline that splits audio on speech with Silero VAD and decodes the resulting
+    <= 30 s chunks in batches; the others decode sequentially on the same model.
+    """
+
+    def __init__(self, size, device, compute_type):
+        if compute_type == "auto":
+            compute_type = self.default_compute_type(device)
+        # CTranslate2 defaults to 4 intra-op threads; the single transcription worker can use every core
+        model = WhisperModel(
+            size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=available_cpus(),
+        )
+
+        # One throwaway decode (Whisper pads it to a full 30 s window) initializes the CUDA context,
+        # cuBLAS handles and the allocator pool inside the cached loader instead of on the first request
+        segments, _ = model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="en", beam_size=1, vad_filter=False)
+        list(segments)
+
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model=model)
+        self.batch_size = BATCH_SIZES[device]
+
+    @staticmethod
+    def default_compute_type(device):
+        """
+        INT8 on CPU and older GPUs; FP16 on tensor-core GPUs (compute capability 7.0+), which run FP16 GEMMs at full rate.
+        """
+        if device == "cuda" and torch.cuda.get_device_capability()[0] >= 7:
+            return "float16"
+        return "int8"
+
+    def transcribe(self, audio, lang, options):
+        language = None if lang == "auto" else lang
+        if options["condition_on_previous_text"] or isinstance(options["temperature"], tuple):
+            segments, _ = self.model.transcribe(audio, language=language, vad_filter=True, **options)
+        else:
+            batched_options = {key: value for key, value in options.items() if key != "condition_on_previous_text"}
+            segments, _ = self.pipeline.transcribe(
+                audio,
+                language=language,
+                vad_filter=True,
+                batch_size=self.batch_size,
+                **batched_options,
+            )
+        # faster-whisper decodes lazily, so each segment is available as soon as its batch is done
+        for seg in segments:
+            yield seg.text
+
+
+class WhisperCppTranscriber:
+    """
+    whisper.cpp backend (pywhispercpp) running 5-bit GGML-quantized models on CPU threads.
+    """
+
+    # Quantized checkpoints published for whisper.cpp
+    GGML_MODELS = {"base": "base-q5_1", "small": "small-q5_1", "medium": "medium-q5_0"}
+
+    def __init__(self, size):
+        from pywhispercpp.model import Model
+
+        if size not in self.GGML_MODELS:
+            raise ValueError(f"No quantized whisper.cpp checkpoint for '{size}'; pick a faster-whisper compute type.")
+        self.model = Model(self.GGML_MODELS[size], n_threads=available_cpus(), print_progress=False, print_realtime=False)
+
+    def transcribe(self, audio, lang, options):
+        params = {"no_context": not options["condition_on_previous_text"]}
+        # whisper.cpp takes a single starting temperature rather than a fallback schedule
+        temperature = options["temperature"]
+        params["temperature"] = temperature[0] if isinstance(temperature, tuple) else temperature
+        for seg in self.model.transcribe(audio, language=lang, **params):
+            yield seg.text
+
+
+class MLXWhisperTranscriber:
+    """
+    Apple Silicon backend running Whisper on the unified-memory GPU through MLX.
+    """
+
+    def __init__(self, size):
+        import mlx_whisper
+
+        if size.startswith("distil"):
+            raise ValueError(f"No MLX checkpoint for '{size}'; pick a faster-whisper compute type.")
+        self.mlx_whisper = mlx_whisper
+        self.repo = f"mlx-community/whisper-{size}-mlx"
+
+    def transcribe(self, audio, lang, options):
+        # mlx_whisper only decodes greedily, so the beam settings don't apply
+        result = self.mlx_whisper.transcribe(
+            audio,
+            path_or_hf_repo=self.repo,
+            language=None if lang == "auto" else lang,
+            temperature=options["temperature"],
+            condition_on_previous_text=options["condition_on_previous_text"],
+        )
+        for seg in result["segments"]:
+            yield seg["text"]
+
+
 # ------------------- Whisper Loader -------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_whisper_model(size, device, compute_type) -> Transcriber:
+    """
+    Build the transcriber for the sidebar settings. Size, device and compute type are the cache
+    key; at most two models stay resident, and the least recently used one is dropped (CTranslate2
+    frees its weights, including VRAM, once the last reference goes away).
+    """
+    if compute_type == "ggml-q5":
+        return WhisperCppTranscriber(size)
+    if compute_type == "mlx":
+        return MLXWhisperTranscriber(size)
+    return FasterWhisperTranscriber(size, device, compute_type)
+
+def load_model_in_background(size, device, compute_type):
+    """
+    Load (and warm) the model on a daemon thread. A transcription that arrives mid-load waits on
+    the same cache entry; if the model is already resident the thread returns immediately.
+    """
+    thread = threading.Thread(target=load_whisper_model, args=(size, device, compute_type), daemon=True)
+    thread.start()
+    return thread
+
 @st.cache_resource(show_spinner=False)
-def load_whisper_model(size):
-    return whisper.load_model(size)
+def start_model_warmup(size, device, compute_type):
+    """
+    Start the background load as soon as these settings are first seen, so the first transcription
+    doesn't wait on deserialization. cache_resource makes this run once per process.
+    """
+    return load_model_in_background(size, device, compute_type)
+
+start_model_warmup(model_size, device, compute_type)
 
 # ------------------- Audio Transcription -------------------
-def transcribe_audio(path, lang):
-    model = load_whisper_model(model_size)
-    options = {}
-    if lang != "auto":
-        options["language"] = lang
-    return model.transcribe(path, **options)
+@st.cache_resource(show_spinner=False)
+def get_transcription_executor():
+    """
+    A single worker shared by all sessions, so only one transcription uses the model at a time.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+def transcribe_audio(audio, lang):
+    """
+    Transcribe a float32 16 kHz array (or a file path), yielding segment texts as they are decoded.
+    Decoding runs on the shared worker thread; segments are handed back through a queue.
+    """
+    transcriber = load_whisper_model(model_size, device, compute_type)
+    options = DECODING_PRESETS[quality]
+    pieces = queue.Queue()
+    cancelled = threading.Event()
+
+    def run():
+        for text in transcriber.transcribe(audio, lang, options):
+            if cancelled.is_set():
+                break
+            pieces.put(text)
+
+    future = get_transcription_executor().submit(run)
+    future.add_done_callback(lambda _: pieces.put(None))
+    try:
+        while (piece := pieces.get()) is not None:
+            yield piece
+        future.result()  # re-raise anything the worker hit
+    finally:
+        # Stop decoding if the session went away (e.g. the user pressed Stop)
+        cancelled.set()
+
+# ------------------- Transcript Cache -------------------
+def content_digest(data):
+    """
+    Hash raw input bytes (BLAKE2b is faster than SHA-256 here) to key the transcript cache.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def get_transcript_cache():
+    """
+    Process-wide LRU of finished transcripts. st.cache_data can't be filled from a streamed
+    result, so the entries are managed here with a lock shared by all sessions.
+    """
+    return OrderedDict(), threading.Lock()
+
+def transcript_key(digest, lang):
+    return (digest, lang, model_size, device, compute_type, quality)
+
+def cached_transcript(digest, lang):
+    cache, lock = get_transcript_cache()
+    key = transcript_key(digest, lang)
+    with lock:
+        if key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+
+def remember_transcript(digest, lang, text):
+    cache, lock = get_transcript_cache()
+    with lock:
+        cache[transcript_key(digest, lang)] = text
+        while len(cache) > TRANSCRIPT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+# ------------------- Transcript Display -------------------
+def render_transcript(text, status, body, done_message, height):
+    if text.strip():
+        status.success(done_message)
+        body.text_area("📄 Transcribed Text", text, height=height)
+    else:
+        body.empty()
+        st.warning("⚠️ No speech detected.")
+
+def show_transcription(audio, lang, done_message="✅ Transcription complete!", height=200, digest=None):
+    """
+    Render segments progressively while decoding, then swap in the full text area. Audio without
+    speech goes straight to "No speech detected". When a content digest is given the finished
+    transcript is cached under it.
+    """
+    status = st.empty()
+    body = st.empty()
+    text = ""
+    if has_speech(audio):
+        for piece in transcribe_audio(audio, lang):
+            text += piece
+            body.text(text)
+
+    if digest is not None:
+        remember_transcript(digest, lang, text)
+    render_transcript(text, status, body, done_message, height)
+
+def show_cached_transcription(digest, lang, done_message="✅ Transcription complete!", height=200):
+    """
+    Show a previously cached transcript for this content. Returns False on a cache miss.
+    """
+    text = cached_transcript(digest, lang)
+    if text is None:
+        return False
+    render_transcript(text, st.empty(), st.empty(), done_message, height)
+    return True
 
 # ------------------- UI Tabs -------------------
 tab1, tab2, tab3 = st.tabs(["📁 Upload Audio File", "🎤 Record from Microphone", "🎬 Video / YouTube"])
@@ -86,24 +569,19 @@ with tab1:
     audio_file = st.file_uploader("Upload Audio File (MP3/WAV/M4A)", type=["mp3", "wav", "m4a"])
 
     if audio_file is not None:
-        st.audio(audio_file, format="audio/mp3")
-
-        with st.spinner("🔍 Transcribing..."):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-                tmp.write(audio_file.read())
-                tmp_path = tmp.name
+        # Read the upload once; getvalue() doesn't move the file pointer and shares the buffer
+        data = audio_file.getvalue()
+        st.audio(data, format="audio/mp3")
+        digest = content_digest(data)
 
-            try:
-                result = transcribe_audio(tmp_path, language)
-                if result["text"].strip():
-                    st.success("✅ Transcription complete!")
-                    st.text_area("📄 Transcribed Text", result["text"], height=200)
-                else:
-                    st.warning("⚠️ No speech detected.")
-            except Exception as e:
-                st.error(f"❌ Transcription failed: {e}")
-            finally:
-                os.remove(tmp_path)
+        if not show_cached_transcription(digest, language):
+            with st.spinner("🔍 Transcribing..."):
+                try:
+                    # Decode in-process with PyAV; a seekable buffer also handles M4A files whose index is at the end
+                    audio = decode_audio(io.BytesIO(data), sampling_rate=SAMPLE_RATE)
+                    show_transcription(audio, language, digest=digest)
+                except Exception as e:
+                    st.error(f"❌ Transcription failed: {e}")
 
 # ------------------- Recorder UI -------------------
 with tab2:
@@ -113,28 +591,19 @@ with tab2:
         sd.wait()
         st.success("✅ Recording complete!")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav", mode="wb") as tmpfile:
-            write(tmpfile.name, sample_rate, audio)
-            tmpfile.flush()
-            os.fsync(tmpfile.fileno())
-            tmpfile_path = tmpfile.name
+        # The WAV is only built for playback/download; Whisper gets the samples directly
+        wav_buffer = io.BytesIO()
+        write(wav_buffer, sample_rate, audio)
+        wav_bytes = wav_buffer.getvalue()
 
-        st.audio(tmpfile_path, format="audio/wav")
-        with open(tmpfile_path, "rb") as f:
-            st.download_button("⬇️ Download Audio", data=f.read(), file_name="recorded_audio.wav")
+        st.audio(wav_bytes, format="audio/wav")
+        st.download_button("⬇️ Download Audio", data=wav_bytes, file_name="recorded_audio.wav")
 
         with st.spinner("🔍 Transcribing..."):
             try:
-                result = transcribe_audio(tmpfile_path, language)
-                if result["text"].strip():
-                    st.success("✅ Transcription complete!")
-                    st.text_area("📄 Transcribed Text", result["text"], height=200)
-                else:
-                    st.warning("⚠️ No speech detected.")
+                show_transcription(pcm16_to_float32(audio, sample_rate), language)
             except Exception as e:
                 st.error(f"❌ Transcription failed: {e}")
-            finally:
-                os.remove(tmpfile_path)
 
 # ------------------- Video / YouTube Transcription UI -------------------
 with tab3:
@@ -145,64 +614,44 @@ with tab3:
 
     # ------------------- Uploaded Video -------------------
     if video_file:
-        st.video(video_file)
-
-        # Save uploaded video safely on Windows
-        video_path = tempfile.mktemp(suffix=".mp4")
-        with open(video_path, "wb") as f:
-            f.write(video_file.read())
-
-        try:
-            with st.spinner("🎧 Extracting audio..."):
-                audio_path = extract_audio_from_video(video_path)
+        video_bytes = video_file.getvalue()
+        st.video(video_bytes)
+        digest = content_digest(video_bytes)
 
-            with st.spinner("🔍 Transcribing..."):
-                result = transcribe_audio(audio_path, language)
-                if result["text"].strip():
-                    st.success("✅ Video Transcription Complete!")
-                    st.text_area("📄 Transcribed Text", result["text"], height=250)
-                else:
-                    st.warning("⚠️ No speech detected.")
-        except Exception as e:
-            st.error(f"❌ Error: {e}")
-        finally:
-            # Cleanup temporary files
-            if os.path.exists(video_path):
-                os.remove(video_path)
-            if 'audio_path' in locals() and os.path.exists(audio_path):
-                os.remove(audio_path)
-
-    # ------------------- YouTube Video -------------------
-    if video_url:
-        st.warning("📥 Downloading from YouTube requires 'yt-dlp' installed.")
+        if not show_cached_transcription(digest, language, "✅ Video Transcription Complete!", height=250):
+            # Overlap a (re)load of the model, e.g. after it was evicted, with audio extraction
+            load_model_in_background(model_size, device, compute_type)
 
-        if st.button("⬇️ Download & Transcribe YouTube Video"):
-            video_path = tempfile.mktemp(suffix=".mp4")  # safer on Windows
-
-            # Download YouTube video
-            st.info("📥 Downloading video...")
             try:
-                subprocess.run(f'yt-dlp -f best -o "{video_path}" "{video_url}"', 
-                               shell=True, check=True)
-                st.success("✅ Download complete.")
-
+                # A seekable in-memory buffer, since MP4/MOV can keep the moov atom at the end
                 with st.spinner("🎧 Extracting audio..."):
-                    audio_path = extract_audio_from_video(video_path)
+                    audio = decode_audio(io.BytesIO(video_bytes), sampling_rate=SAMPLE_RATE)
 
                 with st.spinner("🔍 Transcribing..."):
-                    result = transcribe_audio(audio_path, language)
-                    if result["text"].strip():
-                        st.success("✅ Video Transcription Complete!")
-                        st.text_area("📄 Transcribed Text", result["text"], height=250)
-                    else:
-                        st.warning("⚠️ No speech detected.")
-            except subprocess.CalledProcessError as e:
-                st.error(f"❌ YouTube download failed:\n{e}")
+                    show_transcription(audio, language, "✅ Video Transcription Complete!", height=250, digest=digest)
             except Exception as e:
                 st.error(f"❌ Error: {e}")
-            finally:
-                # Cleanup temporary files
-                if os.path.exists(video_path):
-                    os.remove(video_path)
-                if 'audio_path' in locals() and os.path.exists(audio_path):
-                    os.remove(audio_path)
+
+    # ------------------- YouTube Video -------------------
+    if video_url and get_youtube_dl() is None:
+        st.warning("📥 Downloading from YouTube requires 'yt-dlp' installed.")
+    elif video_url:
+        from yt_dlp.utils import DownloadError
+
+        if st.button("⬇️ Download & Transcribe YouTube Video"):
+            # The URL identifies the content, so a hit skips the download as well
+            digest = content_digest(video_url.encode())
+            if not show_cached_transcription(digest, language, "✅ Video Transcription Complete!", height=250):
+                # The network-bound download overlaps the model (re)load instead of preceding it
+                load_model_in_background(model_size, device, compute_type)
+                try:
+                    with st.spinner("📥 Downloading audio..."):
+                        audio = download_youtube_audio(video_url)
+                    st.success("✅ Download complete.")
+
+                    with st.spinner("🔍 Transcribing..."):
+                        show_transcription(audio, language, "✅ Video Transcription Complete!", height=250, digest=digest)
+                except DownloadError as e:
+                    st.error(f"❌ YouTube download failed:\n{e}")
+                except Exception as e:
+                    st.error(f"❌ Error: {e}")